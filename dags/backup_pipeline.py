@@ -7,6 +7,20 @@ from datetime import datetime
 import pandas as pd
 import io
 import logging
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils_profiling import profiled
+
+try:
+    from utils_alerting import audit_success_callback, audit_failure_callback
+except ImportError as e:
+    logging.error(f"Gagal import utils_alerting: {e}")
+
+    def audit_success_callback(context): pass
+    def audit_failure_callback(context): pass
 
 # --- KONFIGURASI ---
 # Menggunakan Connection ID yang sama dengan gtd_pipeline.py
@@ -118,7 +132,10 @@ def backup_raw_files_minio(**kwargs):
 default_args = {
     'owner': 'airflow',
     'start_date': days_ago(1),
-    'retries': 1
+    'retries': 1,
+
+    'on_success_callback': audit_success_callback,
+    'on_failure_callback': audit_failure_callback
 }
 
 with DAG(
@@ -127,25 +144,27 @@ with DAG(
     description='Backup otomatis Postgres (DWH) dan Raw Data ke MinIO',
     schedule_interval='@weekly',  # Running setiap Minggu tengah malam
     catchup=False,
-    tags=['maintenance', 'backup']
+    tags=['maintenance', 'backup'],
+    # profile=true: task dijalankan dengan cProfile + tracemalloc (lihat utils_profiling.py)
+    params={"profile": False}
 ) as dag:
 
     # Task 1: Buat Bucket Backup jika belum ada
     task_init_bucket = PythonOperator(
         task_id='init_backup_bucket',
-        python_callable=create_backup_bucket
+        python_callable=profiled(create_backup_bucket)
     )
 
     # Task 2: Backup Database Warehouse
     task_backup_db = PythonOperator(
         task_id='backup_database_tables',
-        python_callable=backup_postgres_to_minio
+        python_callable=profiled(backup_postgres_to_minio)
     )
 
     # Task 3: Snapshot Raw Files
     task_backup_files = PythonOperator(
         task_id='snapshot_raw_files',
-        python_callable=backup_raw_files_minio
+        python_callable=profiled(backup_raw_files_minio)
     )
 
     # Alur Eksekusi
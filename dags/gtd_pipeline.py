@@ -1,13 +1,9 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from airflow.operators.bash import BashOperator
 from airflow.providers.postgres.hooks.postgres import PostgresHook
 from airflow.providers.amazon.aws.hooks.s3 import S3Hook
 from airflow.utils.dates import days_ago
 import pandas as pd
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import io
 import logging
 import sys
@@ -25,19 +21,37 @@ except ImportError as e:
     def audit_success_callback(context): pass
     def audit_failure_callback(context): pass
 
+from utils_bulk_load import load_dataframe
+from utils_fingerprint import compute_fingerprint, is_already_loaded, mark_loaded
+from utils_dbt import run_dbt_changed
+from utils_s3_watch import RAW_DATA_DATASET, record_freshness, release_pending_etags
+from utils_oecd import FILE_KEY_PROP, read_oecd_property_csv, upload_oecd_property_if_changed
+from utils_profiling import profiled
+
 try:
-    from risk_model import run_risk_prediction
+    from risk_model import plan_risk_prediction_shards, run_risk_prediction_shard, merge_risk_prediction_shards
 except ImportError as e:
     logging.error(f"Could not import risk_model: {e}")
-    def run_risk_prediction():
+    def plan_risk_prediction_shards():
+        logging.error("Model script not found!")
+        return []
+    def run_risk_prediction_shard(shard, n_shards):
+        logging.error("Model script not found!")
+    def merge_risk_prediction_shards():
         logging.error("Model script not found!")
 
+try:
+    from feature_store import materialize_features
+except ImportError as e:
+    logging.error(f"Could not import feature_store: {e}")
+    def materialize_features():
+        logging.error("Feature store script not found!")
+
 MINIO_CONN_ID = 'minio_conn'
 POSTGRES_CONN_ID = 'postgres_conn'
 BUCKET_NAME = 'raw-data'
 
 FILE_KEY_GTD = 'gtd_raw.csv'
-FILE_KEY_PROP = 'oecd_property.csv'
 
 TABLE_NAME_GTD = 'raw_gtd'            
 TABLE_NAME_PROP = 'raw_property_index' 
@@ -48,6 +62,11 @@ def load_minio_to_postgres_gtd(**kwargs):
     logging.info(f"Downloading {FILE_KEY_GTD} from MinIO...")
     file_obj = s3_hook.get_key(key=FILE_KEY_GTD, bucket_name=BUCKET_NAME)
     file_content = file_obj.get()['Body'].read()
+
+    fingerprint = compute_fingerprint(file_content)
+    if is_already_loaded(TABLE_NAME_GTD, fingerprint):
+        logging.info(f"{FILE_KEY_GTD} tidak berubah sejak load terakhir, skip reload.")
+        return
     
     df = pd.read_csv(io.BytesIO(file_content), encoding='ISO-8859-1', low_memory=False)
     
@@ -62,72 +81,25 @@ def load_minio_to_postgres_gtd(**kwargs):
         conn.execute(f"DROP MATERIALIZED VIEW IF EXISTS {TABLE_NAME_GTD} CASCADE;")
         conn.execute(f"DROP TYPE IF EXISTS {TABLE_NAME_GTD} CASCADE;")
         
-    logging.info(f"Loading {len(df)} rows to Postgres...")
-   
-    df.to_sql(TABLE_NAME_GTD, engine, if_exists='append', index=False)
+    load_dataframe(engine, df, TABLE_NAME_GTD)
+    mark_loaded(TABLE_NAME_GTD, fingerprint)
     logging.info("GTD Data loaded successfully.")
 
 def ingest_oecd_property_data(**kwargs):
-    logging.info("=== EXTRACT: DOWNLOAD DATA OECD API ===")
-    url = "https://sdmx.oecd.org/public/rest/data/OECD.ECO.MPD,DSD_AN_HOUSE_PRICES@DF_HOUSE_PRICES,/.Q.RHP."
-    params = {
-        "startPeriod": "1970-Q1",
-        "endPeriod": "2020-Q4",
-        "format": "sdmx-json"
-    }
-    headers = {"Accept": "application/json"}
-    
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,
-        backoff_factor=2,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    
-    logging.info(f"Fetching data from: {url}")
-    response = session.get(url, params=params, headers=headers, timeout=120)
-    response.raise_for_status()
-    data = response.json()
-    
-    logging.info("Parsing JSON response...")
-    series = data["dataSets"][0]["series"]
-    series_dims = data["structure"]["dimensions"]["series"]
-    obs_dims = data["structure"]["dimensions"]["observation"]
-    countries = series_dims[0]["values"]
-    time_periods = obs_dims[0]["values"]
-
-    records = []
-    for series_key, series_value in series.items():
-        country_idx = int(series_key.split(":")[0])
-        country_name = countries[country_idx]["name"]
-        for obs_key, obs_val in series_value["observations"].items():
-            time_idx = int(obs_key)
-            period = time_periods[time_idx]["id"]
-            records.append({
-                "country": country_name,
-                "period": period,
-                "real_house_price_index": obs_val[0],
-                "year": int(period[:4])
-            })
-    
-    df = pd.DataFrame(records)
-    logging.info(f"Extracted {len(df)} rows.")
-
-    logging.info(f"=== LOAD: UPLOADING TO MINIO ({FILE_KEY_PROP}) ===")
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
+    # Data OECD diambil dari API setiap hari oleh oecd_property_watcher dan disimpan di MinIO;
+    # pipeline cukup membaca file tersebut (API hanya dipanggil di sini untuk bootstrap)
     s3_hook = S3Hook(aws_conn_id=MINIO_CONN_ID)
-    s3_hook.load_string(
-        string_data=csv_buffer.getvalue(),
-        key=FILE_KEY_PROP,
-        bucket_name=BUCKET_NAME,
-        replace=True
-    )
-    logging.info("Success! Data saved to MinIO Raw Bucket.")
+    csv_data = read_oecd_property_csv(s3_hook)
+    if csv_data is None:
+        logging.info(f"{FILE_KEY_PROP} belum ada di MinIO, mengambil langsung dari API OECD...")
+        csv_data, _ = upload_oecd_property_if_changed(s3_hook)
+
+    fingerprint = compute_fingerprint(csv_data)
+    if is_already_loaded(TABLE_NAME_PROP, fingerprint):
+        logging.info("Data OECD tidak berubah sejak load terakhir, skip reload.")
+        return
+
+    df = pd.read_csv(io.StringIO(csv_data))
 
     logging.info(f"=== LOAD: SAVING TO POSTGRES ({TABLE_NAME_PROP}) ===")
     pg_hook = PostgresHook(postgres_conn_id=POSTGRES_CONN_ID)
@@ -137,7 +109,8 @@ def ingest_oecd_property_data(**kwargs):
     with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
         conn.execute(f"DROP TABLE IF EXISTS {TABLE_NAME_PROP} CASCADE;")
 
-    df.to_sql(TABLE_NAME_PROP, engine, if_exists='append', index=False)
+    load_dataframe(engine, df, TABLE_NAME_PROP)
+    mark_loaded(TABLE_NAME_PROP, fingerprint)
     logging.info("Success! Data saved to Postgres.")
 
 default_args = {
@@ -152,28 +125,59 @@ default_args = {
 with DAG(
     'gtd_ingestion_pipeline',
     default_args=default_args,
-    schedule_interval='@daily',
-    catchup=False
+    # Dipicu oleh raw_data_watcher setiap kali gtd_raw.csv atau oecd_property.csv di MinIO berubah
+    # (oecd_property.csv di-refresh harian dari API oleh oecd_property_watcher)
+    schedule=[RAW_DATA_DATASET],
+    max_active_runs=1,
+    catchup=False,
+    # Run gagal -> ETag pemicu dilepas dari pending agar watcher memicu ulang file yang sama
+    on_failure_callback=release_pending_etags,
+    # profile=true: task dijalankan dengan cProfile + tracemalloc (lihat utils_profiling.py)
+    params={"profile": False}
 ) as dag:
 
     ingest_gtd_task = PythonOperator(
         task_id='load_minio_to_postgres',
-        python_callable=load_minio_to_postgres_gtd
+        python_callable=profiled(load_minio_to_postgres_gtd)
     )
 
     ingest_property_task = PythonOperator(
         task_id='load_oecd_property_to_postgres',
-        python_callable=ingest_oecd_property_data
+        python_callable=profiled(ingest_oecd_property_data)
     )
 
-    transform_task = BashOperator(
+    # Hanya rebuild model downstream dari source yang di-reload (+ model yang berubah)
+    transform_task = PythonOperator(
         task_id='dbt_run',
-        bash_command='cd /opt/airflow/dbt_project && dbt run --profiles-dir .'
+        python_callable=profiled(run_dbt_changed)
+    )
+
+    # Feature store: matriks fitur negara-tahun dibangun sekali per build warehouse
+    feature_task = PythonOperator(
+        task_id='materialize_feature_store',
+        python_callable=profiled(materialize_features)
     )
 
-    ml_task = PythonOperator(
+    # ML: plan -> train per shard negara (dynamic task mapping) -> merge
+    plan_ml_task = PythonOperator(
+        task_id='plan_risk_model_shards',
+        python_callable=profiled(plan_risk_prediction_shards)
+    )
+
+    ml_task = PythonOperator.partial(
         task_id='train_risk_model',
-        python_callable=run_risk_prediction
+        python_callable=profiled(run_risk_prediction_shard),
+        retries=2
+    ).expand(op_kwargs=plan_ml_task.output)
+
+    merge_ml_task = PythonOperator(
+        task_id='merge_risk_predictions',
+        python_callable=profiled(merge_risk_prediction_shards)
+    )
+
+    freshness_task = PythonOperator(
+        task_id='record_freshness_latency',
+        python_callable=profiled(record_freshness)
     )
 
-    [ingest_gtd_task, ingest_property_task] >> transform_task >> ml_task
\ No newline at end of file
+    [ingest_gtd_task, ingest_property_task] >> transform_task >> feature_task >> plan_ml_task >> ml_task >> merge_ml_task >> freshness_task
\ No newline at end of file
@@ -0,0 +1,33 @@
+from airflow import DAG
+from airflow.operators.python import PythonOperator
+from airflow.utils.dates import days_ago
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils_oecd import check_oecd_property_update, OECD_PROPERTY_DATASET
+
+# --- DEFINISI DAG ---
+default_args = {
+    'owner': 'airflow',
+    'start_date': days_ago(1),
+    'retries': 1
+}
+
+with DAG(
+    'oecd_property_watcher',
+    default_args=default_args,
+    description='Cek harian API OECD; upload oecd_property.csv ke MinIO hanya jika datanya berubah',
+    schedule='@daily',
+    catchup=False,
+    tags=['ingestion', 'sensor']
+) as dag:
+
+    # File baru di MinIO -> ETag berubah -> raw_data_watcher memicu gtd_ingestion_pipeline.
+    # Data sama -> task di-skip, tidak ada upload dan dataset tidak di-update.
+    check_oecd_update = PythonOperator(
+        task_id='check_oecd_property_update',
+        python_callable=check_oecd_property_update,
+        outlets=[OECD_PROPERTY_DATASET]
+    )
@@ -0,0 +1,50 @@
+from airflow import DAG
+from airflow.operators.python import PythonOperator
+from airflow.utils.dates import days_ago
+from datetime import timedelta
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils_s3_watch import (
+    S3ETagChangeSensor, publish_pending_etags, RAW_BUCKET_NAME, WATCHED_KEYS, RAW_DATA_DATASET
+)
+
+# --- DEFINISI DAG ---
+default_args = {
+    'owner': 'airflow',
+    'start_date': days_ago(1),
+    'retries': 1
+}
+
+with DAG(
+    'raw_data_watcher',
+    default_args=default_args,
+    description='Memicu gtd_ingestion_pipeline saat file raw di MinIO berubah (ETag)',
+    schedule='@continuous',  # Satu run aktif terus-menerus, run baru dimulai begitu run lama selesai
+    max_active_runs=1,
+    catchup=False,
+    tags=['ingestion', 'sensor']
+) as dag:
+
+    # Task 1: Tunggu perubahan ETag (reschedule: slot worker dilepas di antara poke)
+    wait_for_change = S3ETagChangeSensor(
+        task_id='wait_for_raw_data_change',
+        bucket_name=RAW_BUCKET_NAME,
+        keys=WATCHED_KEYS,
+        mode='reschedule',
+        poke_interval=60,
+        timeout=timedelta(days=1).total_seconds(),
+        soft_fail=True
+    )
+
+    # Task 2: Tandai ETag baru sebagai pending dan update Dataset -> memicu gtd_ingestion_pipeline.
+    # ETag baru di-commit oleh task terakhir pipeline (record_freshness_latency), bukan di sini.
+    publish_change = PythonOperator(
+        task_id='publish_raw_data_change',
+        python_callable=publish_pending_etags,
+        outlets=[RAW_DATA_DATASET]
+    )
+
+    wait_for_change >> publish_change
@@ -2,6 +2,8 @@ import logging
 from airflow.providers.postgres.hooks.postgres import PostgresHook
 from datetime import datetime
 
+from utils_profiling import PROFILE_XCOM_KEY
+
 AUDIT_TABLE_NAME = "etl_audit_logs"
 CONN_ID = "postgres_conn"  
 
@@ -17,8 +19,10 @@ def ensure_audit_table_exists():
         duration_seconds FLOAT,
         try_number INT,
         error_message TEXT,
+        profile_uri TEXT,
         created_at TIMESTAMP DEFAULT NOW()
     );
+    ALTER TABLE {AUDIT_TABLE_NAME} ADD COLUMN IF NOT EXISTS profile_uri TEXT;
     """
     try:
         pg_hook = PostgresHook(postgres_conn_id=CONN_ID)
@@ -43,10 +47,14 @@ def log_to_postgres(context, status):
     exception = context.get('exception')
     error_message = str(exception) if exception else None
 
+    # Lokasi profile di MinIO (hanya ada jika task dijalankan dengan profiling aktif)
+    ti = context['task_instance']
+    profile_uri = ti.xcom_pull(task_ids=ti.task_id, key=PROFILE_XCOM_KEY, map_indexes=ti.map_index)
+
     sql_insert = f"""
     INSERT INTO {AUDIT_TABLE_NAME} 
-    (dag_id, task_id, status, execution_date, duration_seconds, try_number, error_message)
-    VALUES (%s, %s, %s, %s, %s, %s, %s);
+    (dag_id, task_id, status, execution_date, duration_seconds, try_number, error_message, profile_uri)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
     """
 
     try:
@@ -58,7 +66,8 @@ def log_to_postgres(context, status):
             execution_date, 
             duration, 
             try_number,
-            error_message
+            error_message,
+            profile_uri
         ))
         logging.info(f"✅ [AUDIT] Log tersimpan ke DB: {task_id} = {status}")
     except Exception as e:
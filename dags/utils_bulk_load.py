@@ -0,0 +1,63 @@
+import io
+import logging
+import os
+import pandas as pd
+
+# "bulk"     : tabel raw dibuat UNLOGGED, diisi via COPY dengan setting sesi bulk-load
+# "standard" : tabel biasa (WAL-logged) diisi via pandas to_sql (perilaku lama)
+# Tabel raw selalu di-rebuild dari MinIO/OECD, jadi aman jika hilang saat crash.
+BULK_LOAD_MODE = os.getenv("GTD_BULK_LOAD_MODE", "bulk")
+
+BULK_SESSION_SETTINGS = {
+    "synchronous_commit": "off",
+    "maintenance_work_mem": "512MB",
+    "work_mem": "64MB",
+}
+
+
+def is_bulk_mode(mode=None):
+    return (mode or BULK_LOAD_MODE) == "bulk"
+
+
+def dbt_vars(mode=None):
+    """Argumen --vars untuk dbt agar model memakai setting sesi yang sama"""
+    return '{"bulk_load": true}' if is_bulk_mode(mode) else '{"bulk_load": false}'
+
+
+def _copy_into_unlogged_table(engine, df, table_name):
+    create_sql = pd.io.sql.get_schema(df, table_name, con=engine)
+    create_sql = create_sql.replace("CREATE TABLE", "CREATE UNLOGGED TABLE", 1)
+
+    csv_buffer = io.StringIO()
+    df.to_csv(csv_buffer, index=False, header=False)
+    csv_buffer.seek(0)
+
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        # SET LOCAL (seperti macro dbt bulk_load_settings): setting hilang saat commit,
+        # koneksi yang kembali ke pool tidak membawa synchronous_commit=off ke pemakai berikutnya
+        for name, value in BULK_SESSION_SETTINGS.items():
+            cursor.execute(f"SET LOCAL {name} = %s", (value,))
+        cursor.execute(create_sql)
+        cursor.copy_expert(f'COPY "{table_name}" FROM STDIN WITH (FORMAT csv)', csv_buffer)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_dataframe(engine, df, table_name, mode=None):
+    """
+    Memuat DataFrame ke tabel (yang sudah di-drop sebelumnya), lalu ANALYZE
+    agar statistik planner langsung akurat untuk dbt run berikutnya.
+    """
+    mode = mode or BULK_LOAD_MODE
+    logging.info(f"Loading {len(df)} rows to {table_name} (mode: {mode})...")
+
+    if is_bulk_mode(mode):
+        _copy_into_unlogged_table(engine, df, table_name)
+    else:
+        df.to_sql(table_name, engine, if_exists='append', index=False)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(f'ANALYZE "{table_name}";')
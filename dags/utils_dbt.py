@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+from airflow.exceptions import AirflowException
+
+from utils_bulk_load import dbt_vars
+from utils_fingerprint import get_untransformed_sources, mark_transformed
+
+DBT_PROJECT_DIR = '/opt/airflow/dbt_project'
+DBT_SOURCE_NAME = 'gtd_source'
+
+# Manifest dari dbt run terakhir yang sukses, dipakai untuk seleksi state:modified+
+DBT_STATE_DIR = os.path.join(DBT_PROJECT_DIR, 'state')
+DBT_TARGET_DIR = os.path.join(DBT_PROJECT_DIR, 'target')
+
+
+def build_dbt_selection(changed_sources, has_state):
+    """
+    Selector dbt: semua model downstream dari source yang di-reload,
+    ditambah model yang SQL/config-nya berubah sejak run terakhir (state:modified+).
+    Tanpa manifest sebelumnya (run pertama) -> None = full run.
+    """
+    if not has_state:
+        return None
+    selectors = [f"source:{DBT_SOURCE_NAME}.{table}+" for table in changed_sources]
+    selectors.append("state:modified+")
+    return selectors
+
+
+def log_run_results():
+    """Log durasi per model dari target/run_results.json (terlama di atas)"""
+    path = os.path.join(DBT_TARGET_DIR, 'run_results.json')
+    if not os.path.exists(path):
+        return
+
+    with open(path) as f:
+        run_results = json.load(f)
+
+    results = sorted(run_results.get('results', []), key=lambda r: r.get('execution_time', 0), reverse=True)
+    logging.info("=" * 60)
+    logging.info(f"⏱️ DBT MODEL TIMINGS ({len(results)} models, total {run_results.get('elapsed_time', 0):.1f}s)")
+    for result in results:
+        model_name = result['unique_id'].split('.')[-1]
+        logging.info(f"   {model_name:<25} {result['status']:<8} {result['execution_time']:.2f}s")
+    logging.info("=" * 60)
+
+
+def run_dbt_changed(**kwargs):
+    changed_sources = get_untransformed_sources()
+    has_state = os.path.exists(os.path.join(DBT_STATE_DIR, 'manifest.json'))
+    selectors = build_dbt_selection(changed_sources, has_state)
+
+    command = ['dbt', 'run', '--profiles-dir', '.', '--vars', dbt_vars()]
+    if selectors is None:
+        logging.info("Tidak ada manifest sebelumnya, menjalankan full dbt run.")
+    else:
+        logging.info(f"Source berubah: {changed_sources or 'tidak ada'} -> select {selectors}")
+        command += ['--select', *selectors, '--state', DBT_STATE_DIR]
+
+    logging.info(f"Running: {' '.join(command)}")
+    process = subprocess.run(command, cwd=DBT_PROJECT_DIR, capture_output=True, text=True)
+    logging.info(process.stdout)
+
+    log_run_results()
+
+    if process.returncode != 0:
+        logging.error(process.stderr)
+        raise AirflowException(f"dbt run gagal (exit code {process.returncode})")
+
+    # Simpan manifest untuk seleksi berikutnya & tandai source sudah diproses
+    os.makedirs(DBT_STATE_DIR, exist_ok=True)
+    shutil.copy(os.path.join(DBT_TARGET_DIR, 'manifest.json'), os.path.join(DBT_STATE_DIR, 'manifest.json'))
+    mark_transformed(changed_sources)
@@ -0,0 +1,90 @@
+import hashlib
+import logging
+from airflow.providers.postgres.hooks.postgres import PostgresHook
+
+FINGERPRINT_TABLE_NAME = "etl_load_fingerprints"
+CONN_ID = "postgres_conn"
+
+# loaded_fingerprint      : isi terakhir yang dimuat ke tabel raw
+# transformed_fingerprint : isi terakhir yang sudah berhasil diproses dbt
+# Sumber dianggap "berubah" untuk dbt selama keduanya berbeda, jadi dbt run yang gagal
+# akan mengulang subgraph yang sama pada run berikutnya.
+
+
+def ensure_fingerprint_table_exists(pg_hook):
+    pg_hook.run(f"""
+    CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE_NAME} (
+        source_table VARCHAR(100) PRIMARY KEY,
+        loaded_fingerprint VARCHAR(64),
+        loaded_at TIMESTAMP,
+        transformed_fingerprint VARCHAR(64),
+        transformed_at TIMESTAMP
+    );
+    """)
+
+
+def compute_fingerprint(content):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.md5(content).hexdigest()
+
+
+def _table_has_rows(pg_hook, table_name):
+    # Tabel raw UNLOGGED dikosongkan Postgres setelah crash recovery / restore PITR,
+    # dan pg_dump --no-unlogged-table-data me-restore-nya kosong: fingerprint saja tidak cukup
+    if not pg_hook.get_first("SELECT to_regclass(%s) IS NOT NULL;", parameters=(table_name,))[0]:
+        return False
+    return pg_hook.get_first(f"SELECT EXISTS (SELECT 1 FROM {table_name});")[0]
+
+
+def is_already_loaded(table_name, fingerprint):
+    """True jika tabel raw sudah berisi data dengan fingerprint yang sama (reload bisa di-skip)"""
+    pg_hook = PostgresHook(postgres_conn_id=CONN_ID)
+    ensure_fingerprint_table_exists(pg_hook)
+
+    row = pg_hook.get_first(
+        f"SELECT loaded_fingerprint FROM {FINGERPRINT_TABLE_NAME} WHERE source_table = %s;",
+        parameters=(table_name,)
+    )
+    if row is None or row[0] != fingerprint:
+        return False
+
+    if not _table_has_rows(pg_hook, table_name):
+        logging.warning(f"⚠️ [FINGERPRINT] {table_name} kosong/hilang meski fingerprint cocok, reload ulang.")
+        return False
+    return True
+
+
+def mark_loaded(table_name, fingerprint):
+    pg_hook = PostgresHook(postgres_conn_id=CONN_ID)
+    ensure_fingerprint_table_exists(pg_hook)
+    pg_hook.run(f"""
+    INSERT INTO {FINGERPRINT_TABLE_NAME} (source_table, loaded_fingerprint, loaded_at)
+    VALUES (%s, %s, NOW())
+    ON CONFLICT (source_table) DO UPDATE
+    SET loaded_fingerprint = EXCLUDED.loaded_fingerprint, loaded_at = EXCLUDED.loaded_at;
+    """, parameters=(table_name, fingerprint))
+    logging.info(f"🔖 [FINGERPRINT] {table_name} = {fingerprint}")
+
+
+def get_untransformed_sources():
+    """Tabel raw yang sudah di-reload tetapi belum diproses dbt"""
+    pg_hook = PostgresHook(postgres_conn_id=CONN_ID)
+    ensure_fingerprint_table_exists(pg_hook)
+    rows = pg_hook.get_records(f"""
+    SELECT source_table FROM {FINGERPRINT_TABLE_NAME}
+    WHERE transformed_fingerprint IS DISTINCT FROM loaded_fingerprint
+    ORDER BY source_table;
+    """)
+    return [row[0] for row in rows]
+
+
+def mark_transformed(source_tables):
+    if not source_tables:
+        return
+    pg_hook = PostgresHook(postgres_conn_id=CONN_ID)
+    pg_hook.run(f"""
+    UPDATE {FINGERPRINT_TABLE_NAME}
+    SET transformed_fingerprint = loaded_fingerprint, transformed_at = NOW()
+    WHERE source_table = ANY(%s);
+    """, parameters=(list(source_tables),))
@@ -0,0 +1,113 @@
+import io
+import logging
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from airflow.datasets import Dataset
+from airflow.exceptions import AirflowSkipException
+from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+
+from utils_fingerprint import compute_fingerprint
+
+MINIO_CONN_ID = 'minio_conn'
+BUCKET_NAME = 'raw-data'
+FILE_KEY_PROP = 'oecd_property.csv'
+
+OECD_URL = "https://sdmx.oecd.org/public/rest/data/OECD.ECO.MPD,DSD_AN_HOUSE_PRICES@DF_HOUSE_PRICES,/.Q.RHP."
+OECD_PARAMS = {
+    "startPeriod": "1970-Q1",
+    "endPeriod": "2020-Q4",
+    "format": "sdmx-json"
+}
+
+# Di-update oleh oecd_property_watcher setiap kali hasil API berubah (lineage). Yang memicu
+# gtd_ingestion_pipeline adalah raw_data_watcher, yang juga mengawasi ETag file ini di MinIO.
+OECD_PROPERTY_DATASET = Dataset(f"s3://{BUCKET_NAME}/{FILE_KEY_PROP}")
+
+
+def fetch_oecd_property_csv():
+    """Download OECD Real House Price Index (SDMX-JSON) dan kembalikan sebagai CSV"""
+    logging.info("=== EXTRACT: DOWNLOAD DATA OECD API ===")
+    headers = {"Accept": "application/json"}
+
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=5,
+        backoff_factor=2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET", "OPTIONS"]
+    )
+    adapter = HTTPAdapter(max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    logging.info(f"Fetching data from: {OECD_URL}")
+    response = session.get(OECD_URL, params=OECD_PARAMS, headers=headers, timeout=120)
+    response.raise_for_status()
+    data = response.json()
+
+    logging.info("Parsing JSON response...")
+    series = data["dataSets"][0]["series"]
+    series_dims = data["structure"]["dimensions"]["series"]
+    obs_dims = data["structure"]["dimensions"]["observation"]
+    countries = series_dims[0]["values"]
+    time_periods = obs_dims[0]["values"]
+
+    records = []
+    for series_key, series_value in series.items():
+        country_idx = int(series_key.split(":")[0])
+        country_name = countries[country_idx]["name"]
+        for obs_key, obs_val in series_value["observations"].items():
+            time_idx = int(obs_key)
+            period = time_periods[time_idx]["id"]
+            records.append({
+                "country": country_name,
+                "period": period,
+                "real_house_price_index": obs_val[0],
+                "year": int(period[:4])
+            })
+
+    df = pd.DataFrame(records)
+    logging.info(f"Extracted {len(df)} rows.")
+
+    csv_buffer = io.StringIO()
+    df.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+
+def read_oecd_property_csv(s3_hook):
+    """Isi oecd_property.csv di MinIO, atau None jika belum pernah di-upload"""
+    if not s3_hook.check_for_key(FILE_KEY_PROP, bucket_name=BUCKET_NAME):
+        return None
+    return s3_hook.read_key(key=FILE_KEY_PROP, bucket_name=BUCKET_NAME)
+
+
+def upload_oecd_property_if_changed(s3_hook):
+    """
+    Ambil data OECD terbaru; upload ke MinIO hanya jika fingerprint-nya berbeda dari file
+    yang sudah ada. Mengembalikan (isi CSV terbaru, apakah file di MinIO berubah).
+    """
+    csv_data = fetch_oecd_property_csv()
+
+    current = read_oecd_property_csv(s3_hook)
+    if current is not None and compute_fingerprint(current) == compute_fingerprint(csv_data):
+        logging.info("Data OECD tidak berubah sejak upload terakhir.")
+        return csv_data, False
+
+    logging.info(f"=== LOAD: UPLOADING TO MINIO ({FILE_KEY_PROP}) ===")
+    s3_hook.load_string(
+        string_data=csv_data,
+        key=FILE_KEY_PROP,
+        bucket_name=BUCKET_NAME,
+        replace=True
+    )
+    logging.info("Success! Data saved to MinIO Raw Bucket.")
+    return csv_data, True
+
+
+def check_oecd_property_update(**kwargs):
+    """Task harian oecd_property_watcher: di-skip (dataset tidak di-update) jika data OECD sama"""
+    _, changed = upload_oecd_property_if_changed(S3Hook(aws_conn_id=MINIO_CONN_ID))
+    if not changed:
+        raise AirflowSkipException("Data OECD tidak berubah")
@@ -0,0 +1,89 @@
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import tracemalloc
+from airflow.operators.python import get_current_context
+from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+
+MINIO_CONN_ID = 'minio_conn'
+PROFILE_BUCKET_NAME = 'pipeline-profiles'
+PROFILE_XCOM_KEY = 'profile_uri'
+TOP_N = 30
+
+# Aktif jika env GTD_TASK_PROFILING=1 (semua run) atau DAG param profile=true (per run)
+PROFILING_ENV = 'GTD_TASK_PROFILING'
+
+
+def profiling_enabled(context):
+    if os.getenv(PROFILING_ENV, '').lower() in ('1', 'true', 'yes'):
+        return True
+    return bool(context.get('params', {}).get('profile', False))
+
+
+def _profile_prefix(context):
+    ti = context['task_instance']
+    task_key = ti.task_id if ti.map_index < 0 else f"{ti.task_id}.{ti.map_index}"
+    return f"{ti.dag_id}/{context['run_id']}/{task_key}/try_{ti.try_number}"
+
+
+def upload_profile(context, profiler, snapshot, peak_bytes):
+    """Upload hasil cProfile (.prof + ringkasan teks) dan top-N alokasi tracemalloc ke MinIO"""
+    s3_hook = S3Hook(aws_conn_id=MINIO_CONN_ID)
+    if not s3_hook.check_for_bucket(PROFILE_BUCKET_NAME):
+        s3_hook.create_bucket(bucket_name=PROFILE_BUCKET_NAME)
+
+    prefix = _profile_prefix(context)
+
+    # 1. CPU: file .prof (bisa dibuka dengan snakeviz / pstats) + ringkasan cumulative time
+    raw_path = f"/tmp/{prefix.replace('/', '_')}.prof"
+    profiler.dump_stats(raw_path)
+    s3_hook.load_file(filename=raw_path, key=f"{prefix}/cpu.prof", bucket_name=PROFILE_BUCKET_NAME, replace=True)
+    os.remove(raw_path)
+
+    cpu_text = io.StringIO()
+    pstats.Stats(profiler, stream=cpu_text).sort_stats('cumulative').print_stats(TOP_N)
+    s3_hook.load_string(cpu_text.getvalue(), key=f"{prefix}/cpu_top.txt", bucket_name=PROFILE_BUCKET_NAME, replace=True)
+
+    # 2. MEMORY: top-N baris kode dengan alokasi terbesar
+    mem_lines = [f"Peak traced memory: {peak_bytes / 1024 ** 2:.1f} MiB", ""]
+    for stat in snapshot.statistics('lineno')[:TOP_N]:
+        mem_lines.append(str(stat))
+    s3_hook.load_string("\n".join(mem_lines), key=f"{prefix}/memory_top.txt", bucket_name=PROFILE_BUCKET_NAME, replace=True)
+
+    profile_uri = f"s3://{PROFILE_BUCKET_NAME}/{prefix}/"
+    context['task_instance'].xcom_push(key=PROFILE_XCOM_KEY, value=profile_uri)
+    logging.info(f"🔬 [PROFILE] Tersimpan di {profile_uri}")
+
+
+def profiled(func):
+    """
+    Decorator untuk python_callable: jika profiling aktif, task dijalankan di bawah
+    cProfile + tracemalloc dan hasilnya di-upload ke MinIO. Jika tidak aktif,
+    callable dipanggil langsung (hanya satu pengecekan flag).
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        context = get_current_context()
+        if not profiling_enabled(context):
+            return func(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            try:
+                upload_profile(context, profiler, snapshot, peak_bytes)
+            except Exception as e:
+                # Gagal upload profile tidak boleh menggagalkan task
+                logging.error(f"❌ [PROFILE] Gagal upload profile: {e}")
+
+    return wrapper
@@ -0,0 +1,245 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from airflow.datasets import Dataset
+from airflow.models import Variable
+from airflow.models.xcom import XCom, XCOM_RETURN_KEY
+from airflow.sensors.base import BaseSensorOperator
+from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+from airflow.providers.postgres.hooks.postgres import PostgresHook
+
+MINIO_CONN_ID = 'minio_conn'
+POSTGRES_CONN_ID = 'postgres_conn'
+RAW_BUCKET_NAME = 'raw-data'
+WATCHED_KEYS = ['gtd_raw.csv', 'oecd_property.csv']
+
+# Variable Airflow berisi ETag terakhir yang sudah diproses: {"gtd_raw.csv": "\"abc...\""}
+# Baru di-commit oleh task terakhir gtd_ingestion_pipeline (at-least-once): jika run gagal,
+# watcher memicu pipeline lagi untuk objek yang sama.
+ETAG_VARIABLE = 'gtd_raw_etags'
+# ETag yang sudah memicu pipeline tetapi run-nya belum selesai (agar watcher @continuous
+# tidak memicu ulang setiap poke selama pipeline berjalan)
+PENDING_ETAG_VARIABLE = 'gtd_raw_etags_pending'
+# Run gagal per ETag: {"gtd_raw.csv": {"etag": ..., "attempts": 2, "retry_after": "<iso>"}}.
+# Pemicuan ulang ditunda dengan backoff eksponensial; setelah MAX_PIPELINE_ATTEMPTS gagal,
+# ETag tersebut tidak dipicu lagi sampai ada file baru (ETag berbeda) di MinIO.
+FAILED_ETAG_VARIABLE = 'gtd_raw_etags_failed'
+MAX_PIPELINE_ATTEMPTS = 3
+RETRY_BACKOFF = timedelta(minutes=10)
+FRESHNESS_TABLE_NAME = 'pipeline_freshness_logs'
+
+# Dataset yang di-update oleh raw_data_watcher dan menjadi schedule gtd_ingestion_pipeline.
+# Satu dataset untuk semua WATCHED_KEYS: schedule berisi beberapa dataset di Airflow 2.7
+# berarti menunggu SEMUA dataset ter-update, bukan salah satu.
+RAW_DATA_DATASET = Dataset(f"s3://{RAW_BUCKET_NAME}/")
+
+
+def get_object_etags(s3_hook, bucket, keys):
+    """ETag & LastModified setiap key yang ada di bucket (key yang belum ada di-skip)"""
+    etags = {}
+    for key in keys:
+        if not s3_hook.check_for_key(key, bucket_name=bucket):
+            continue
+        head = s3_hook.head_object(key=key, bucket_name=bucket)
+        etags[key] = {"etag": head["ETag"], "last_modified": head["LastModified"]}
+    return etags
+
+
+def is_retry_blocked(failure, etag, now):
+    """True jika ETag ini pernah gagal dan masih dalam backoff / sudah melewati batas percobaan"""
+    if not failure or failure["etag"] != etag:
+        return False
+    if failure["attempts"] >= MAX_PIPELINE_ATTEMPTS:
+        return True
+    return now < datetime.fromisoformat(failure["retry_after"])
+
+
+def detect_changed_keys(current, last_etags, pending_etags=None, failed_etags=None, now=None):
+    """
+    Key yang ETag-nya berbeda dari ETag terakhir yang diproses maupun yang sedang diproses,
+    dan tidak sedang ditahan karena run sebelumnya untuk ETag yang sama gagal.
+    """
+    pending_etags = pending_etags or {}
+    failed_etags = failed_etags or {}
+    now = now or datetime.now(timezone.utc)
+    return [
+        key for key, info in current.items()
+        if info["etag"] not in (last_etags.get(key), pending_etags.get(key))
+        and not is_retry_blocked(failed_etags.get(key), info["etag"], now)
+    ]
+
+
+def record_failed_attempt(failed_etags, key, etag, now):
+    """Tambah hitungan gagal ETag (reset jika ETag berbeda) dan jadwalkan retry berikutnya"""
+    failure = failed_etags.get(key)
+    attempts = failure["attempts"] + 1 if failure and failure["etag"] == etag else 1
+    failed_etags[key] = {
+        "etag": etag,
+        "attempts": attempts,
+        "retry_after": (now + RETRY_BACKOFF * 2 ** (attempts - 1)).isoformat()
+    }
+    return failed_etags[key]
+
+
+class S3ETagChangeSensor(BaseSensorOperator):
+    """
+    Menunggu sampai ETag salah satu key di bucket berubah.
+    Dipakai dengan mode='reschedule' agar slot worker dilepas di antara poke
+    (docker-compose tidak menjalankan triggerer untuk sensor deferrable).
+    Bisa diuji terhadap MinIO lokal atau S3 stand-in lain lewat connection minio_conn.
+    """
+
+    def __init__(self, bucket_name, keys, aws_conn_id=MINIO_CONN_ID, etag_variable=ETAG_VARIABLE,
+                 pending_etag_variable=PENDING_ETAG_VARIABLE, failed_etag_variable=FAILED_ETAG_VARIABLE,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.bucket_name = bucket_name
+        self.keys = keys
+        self.aws_conn_id = aws_conn_id
+        self.etag_variable = etag_variable
+        self.pending_etag_variable = pending_etag_variable
+        self.failed_etag_variable = failed_etag_variable
+
+    def poke(self, context):
+        s3_hook = S3Hook(aws_conn_id=self.aws_conn_id)
+        current = get_object_etags(s3_hook, self.bucket_name, self.keys)
+        last_etags = Variable.get(self.etag_variable, default_var={}, deserialize_json=True)
+        pending_etags = Variable.get(self.pending_etag_variable, default_var={}, deserialize_json=True)
+        failed_etags = Variable.get(self.failed_etag_variable, default_var={}, deserialize_json=True)
+
+        changed = detect_changed_keys(current, last_etags, pending_etags, failed_etags)
+        if not changed:
+            return False
+
+        logging.info(f"📥 Objek berubah di {self.bucket_name}: {changed}")
+        context['ti'].xcom_push(key='changed_objects', value={
+            key: {"etag": current[key]["etag"], "last_modified": current[key]["last_modified"].isoformat()}
+            for key in changed
+        })
+        return True
+
+
+def publish_pending_etags(**kwargs):
+    """
+    Tandai objek yang berubah sebagai 'pending' lalu kembalikan ETag + LastModified-nya.
+    Return value (XCom) dibaca pipeline lewat triggering_dataset_events, jadi latency dihitung
+    dari objek yang benar-benar memicu run, bukan objek yang ada di bucket saat run selesai.
+    """
+    changed = kwargs['ti'].xcom_pull(task_ids='wait_for_raw_data_change', key='changed_objects')
+    pending = Variable.get(PENDING_ETAG_VARIABLE, default_var={}, deserialize_json=True)
+    pending.update({key: info["etag"] for key, info in changed.items()})
+    Variable.set(PENDING_ETAG_VARIABLE, pending, serialize_json=True)
+    logging.info(f"📤 ETag pending (menunggu gtd_ingestion_pipeline): {pending}")
+    return changed
+
+
+def get_triggering_objects(context):
+    """Objek {key: {etag, last_modified}} yang dipublish run raw_data_watcher pemicu run ini"""
+    objects = {}
+    events = context.get('triggering_dataset_events', {}).get(RAW_DATA_DATASET.uri, [])
+    for event in events:
+        published = XCom.get_one(
+            dag_id=event.source_dag_id,
+            run_id=event.source_run_id,
+            task_id=event.source_task_id,
+            key=XCOM_RETURN_KEY
+        )
+        # Event diurutkan dari yang terlama: objek terbaru per key menang
+        objects.update(published or {})
+    return objects
+
+
+def _release_pending(objects):
+    pending = Variable.get(PENDING_ETAG_VARIABLE, default_var={}, deserialize_json=True)
+    for key, info in objects.items():
+        if pending.get(key) == info["etag"]:
+            pending.pop(key)
+    Variable.set(PENDING_ETAG_VARIABLE, pending, serialize_json=True)
+
+
+def commit_etags(objects):
+    """Simpan ETag yang sudah selesai diproses agar objek yang sama tidak memicu pipeline lagi"""
+    etags = Variable.get(ETAG_VARIABLE, default_var={}, deserialize_json=True)
+    etags.update({key: info["etag"] for key, info in objects.items()})
+    Variable.set(ETAG_VARIABLE, etags, serialize_json=True)
+    _release_pending(objects)
+
+    failed = Variable.get(FAILED_ETAG_VARIABLE, default_var={}, deserialize_json=True)
+    for key in objects:
+        failed.pop(key, None)
+    Variable.set(FAILED_ETAG_VARIABLE, failed, serialize_json=True)
+    logging.info(f"✅ ETag tersimpan: {etags}")
+
+
+def release_pending_etags(context):
+    """
+    on_failure_callback DAG: catat kegagalan per ETag lalu lepas dari pending. Watcher memicu
+    ulang objek yang sama setelah backoff, maksimal MAX_PIPELINE_ATTEMPTS kali.
+    """
+    objects = get_triggering_objects(context)
+    if not objects:
+        return
+
+    now = datetime.now(timezone.utc)
+    failed = Variable.get(FAILED_ETAG_VARIABLE, default_var={}, deserialize_json=True)
+    for key, info in objects.items():
+        failure = record_failed_attempt(failed, key, info["etag"], now)
+        if failure["attempts"] >= MAX_PIPELINE_ATTEMPTS:
+            logging.error(f"❌ {key} gagal diproses {failure['attempts']}x, tidak dipicu ulang sampai ada file baru.")
+        else:
+            logging.warning(f"⚠️ Run gagal untuk {key} (percobaan {failure['attempts']}), "
+                            f"dipicu ulang setelah {failure['retry_after']}.")
+    Variable.set(FAILED_ETAG_VARIABLE, failed, serialize_json=True)
+    _release_pending(objects)
+
+
+def ensure_freshness_table_exists(pg_hook):
+    pg_hook.run(f"""
+    CREATE TABLE IF NOT EXISTS {FRESHNESS_TABLE_NAME} (
+        log_id SERIAL PRIMARY KEY,
+        dag_id VARCHAR(100),
+        run_id VARCHAR(250),
+        object_key VARCHAR(250),
+        object_etag VARCHAR(100),
+        landed_at TIMESTAMPTZ,
+        completed_at TIMESTAMPTZ,
+        latency_seconds FLOAT,
+        created_at TIMESTAMP DEFAULT NOW()
+    );
+    """)
+
+
+def record_freshness(**kwargs):
+    """
+    Task terakhir gtd_ingestion_pipeline. Latency end-to-end: dari objek pemicu mendarat
+    di MinIO (LastModified) sampai prediksi ML selesai dibuat, lalu ETag-nya di-commit.
+    Run manual (tanpa dataset event) tidak dicatat.
+    """
+    objects = get_triggering_objects(kwargs)
+    if not objects:
+        logging.info("Run tidak dipicu raw_data_watcher, freshness tidak dicatat.")
+        return
+
+    pg_hook = PostgresHook(postgres_conn_id=POSTGRES_CONN_ID)
+    ensure_freshness_table_exists(pg_hook)
+
+    completed_at = datetime.now(timezone.utc)
+
+    for key, info in objects.items():
+        landed_at = datetime.fromisoformat(info["last_modified"])
+        latency = (completed_at - landed_at).total_seconds()
+        pg_hook.run(f"""
+        INSERT INTO {FRESHNESS_TABLE_NAME}
+        (dag_id, run_id, object_key, object_etag, landed_at, completed_at, latency_seconds)
+        VALUES (%s, %s, %s, %s, %s, %s, %s);
+        """, parameters=(
+            kwargs['dag'].dag_id,
+            kwargs['run_id'],
+            key,
+            info["etag"],
+            landed_at,
+            completed_at,
+            latency
+        ))
+        logging.info(f"⏱️ [FRESHNESS] {key}: {latency:.0f}s dari landing sampai prediksi siap")
+
+    commit_etags(objects)
@@ -0,0 +1,8 @@
+{% macro bulk_load_settings() %}
+    {#- SET LOCAL: hanya berlaku di transaksi model ini (termasuk post_hook index/constraint) -#}
+    {%- if var('bulk_load', false) -%}
+    set local synchronous_commit = off;
+    set local maintenance_work_mem = '512MB';
+    set local work_mem = '64MB';
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,8 @@
+{% macro snap_coordinate(column) %}
+    {#- Bulatkan koordinat ke var('location_precision') desimal (2 ~ 1.1 km). null = tanpa snapping -#}
+    {%- if var('location_precision', 2) is none -%}
+    {{ column }}
+    {%- else -%}
+    cast(round(cast({{ column }} as numeric), {{ var('location_precision', 2) }}) as double precision)
+    {%- endif -%}
+{% endmacro %}
@@ -10,8 +10,13 @@ select
     country_txt as country_name,
     region_txt as region_name,
     city as city_name,
-    latitude,
-    longitude,
+    {{ snap_coordinate('latitude') }} as latitude,
+    {{ snap_coordinate('longitude') }} as longitude,
+    -- Key lokasi dihitung sekali di sini, dipakai dim_location (PK) dan fact_attacks (FK)
+    {{ dbt_utils.generate_surrogate_key([
+        'country_txt', 'region_txt', 'city',
+        snap_coordinate('latitude'), snap_coordinate('longitude')
+    ]) }} as location_id,
     coalesce(nkill, 0) as killed,
     coalesce(nwound, 0) as wounded,
     attacktype1_txt as attack_type,
@@ -6,8 +6,11 @@
     ]
 ) }}
 
+-- Koordinat sudah di-snap di stg_attacks (var location_precision),
+-- sehingga selisih kecil koordinat untuk kota yang sama tidak membuat baris baru.
 with distinct_locations as (
     select distinct
+        location_id,
         country_name,
         region_name,
         city_name,
@@ -22,7 +25,7 @@ countries as (
 )
 
 select
-    {{ dbt_utils.generate_surrogate_key(['l.country_name', 'l.region_name', 'l.city_name', 'l.latitude', 'l.longitude']) }} as location_id,
+    l.location_id,
     
     c.country_id,
 
@@ -1,6 +1,10 @@
 {{ config(
     materialized='table',
-    post_hook=["ALTER TABLE {{ this }} ADD PRIMARY KEY (narrative_id)"]
+    post_hook=[
+        "ALTER TABLE {{ this }} ADD PRIMARY KEY (narrative_id)",
+        "ALTER TABLE {{ this }} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', incident_summary)) STORED",
+        "CREATE INDEX ON {{ this }} USING GIN (search_vector)"
+    ]
 ) }}
 
 select distinct
@@ -9,10 +9,13 @@
         "ALTER TABLE {{ this }} ADD CONSTRAINT fk_perpetrator FOREIGN KEY (perpetrator_id) REFERENCES {{ ref('dim_perpetrator') }} (perpetrator_id)",
         "ALTER TABLE {{ this }} ADD CONSTRAINT fk_weapon FOREIGN KEY (weapon_id) REFERENCES {{ ref('dim_weapon') }} (weapon_id)",
         "ALTER TABLE {{ this }} ADD CONSTRAINT fk_narrative FOREIGN KEY (narrative_id) REFERENCES {{ ref('dim_narrative') }} (narrative_id)",
-        "ALTER TABLE {{ this }} ADD CONSTRAINT fk_economy FOREIGN KEY (economy_id) REFERENCES {{ ref('dim_economy') }} (economy_id)"
+        "ALTER TABLE {{ this }} ADD CONSTRAINT fk_economy FOREIGN KEY (economy_id) REFERENCES {{ ref('dim_economy') }} (economy_id)",
+        "CREATE INDEX ON {{ this }} (narrative_id)"
     ]
 ) }}
 
+-- depends_on: {{ ref('dim_location') }}
+
 with source as (
     select * from {{ ref('stg_attacks') }}
 ),
@@ -21,7 +24,6 @@ with source as (
 dim_country as (select country_id, country_name from {{ ref('dim_country') }}),
 dim_economy as (select economy_id, country_id, year from {{ ref('dim_economy') }}),
 dim_date as (select date_id, year, month, day from {{ ref('dim_date') }}),
-dim_location as (select location_id, country_name, region_name, city_name, latitude, longitude from {{ ref('dim_location') }}),
 dim_attack as (select attack_id, attack_type from {{ ref('dim_attack') }}),
 dim_target as (select target_id, target_type from {{ ref('dim_target') }}),
 dim_perpetrator as (select perpetrator_id, group_name from {{ ref('dim_perpetrator') }}),
@@ -32,7 +34,8 @@ final as (
     select
         -- 2. AMBIL ID DARI HASIL JOIN (BUKAN GENERATE ULANG)
         d.date_id,
-        l.location_id,
+        -- location_id sudah dihitung di staging dari koordinat yang di-snap (tanpa join 5 kolom)
+        source.location_id,
         a.attack_id,
         t.target_id,
         p.perpetrator_id,
@@ -51,14 +54,6 @@ final as (
     
     -- 3. JOIN KE DIMENSI BERDASARKAN "NATURAL KEY"
     
-    -- Join Location
-    left join dim_location l 
-        on source.country_name = l.country_name
-        and source.region_name = l.region_name
-        and source.city_name = l.city_name
-        and source.latitude = l.latitude 
-        and source.longitude = l.longitude
-
     -- Join Date
     left join dim_date d 
         on source.year = d.year 
@@ -8,6 +8,9 @@
 # Usage: 
 #   ./manage_disaster_recovery.sh backup
 #   ./manage_disaster_recovery.sh restore <timestamp_folder>
+#   ./manage_disaster_recovery.sh base-backup
+#   ./manage_disaster_recovery.sh restore --to "<timestamp>"
+#   ./manage_disaster_recovery.sh wal-status
 # ==============================================================================
 
 # --- KONFIGURASI ---
@@ -18,6 +21,14 @@ PG_DB="airflow"
 PG_SERVICE_NAME="postgres"  # Nama service di docker-compose.yaml
 MINIO_DATA_DIR="./minio_data"
 
+# --- KONFIGURASI PITR (WAL Archiving ke MinIO) ---
+WAL_ARCHIVER_SERVICE="wal-archiver"   # Service mc di docker-compose.yaml
+MINIO_ALIAS="local"
+PITR_BUCKET="system-backups"
+PITR_BASE_PREFIX="$MINIO_ALIAS/$PITR_BUCKET/base"
+PITR_WAL_PREFIX="$MINIO_ALIAS/$PITR_BUCKET/wal_archive"
+PG_DATA_DIR="./postgres_data"         # /pitr_restore di container = ./pitr_restore di host
+
 # Pastikan folder backup ada
 mkdir -p "$BACKUP_DIR"
 
@@ -47,7 +58,8 @@ run_backup() {
     # Eksekusi pg_dump dari dalam container
     # -c: Clean (DROP commands included)
     # -U: User
-    docker compose exec -T $PG_SERVICE_NAME pg_dump -U $PG_USER -c $PG_DB > "$CURRENT_BACKUP_PATH/postgres_dump.sql"
+    # --no-unlogged-table-data: tabel raw UNLOGGED di-rebuild dari MinIO, tidak perlu di-dump
+    docker compose exec -T $PG_SERVICE_NAME pg_dump -U $PG_USER -c --no-unlogged-table-data $PG_DB > "$CURRENT_BACKUP_PATH/postgres_dump.sql"
     
     if [ $? -eq 0 ]; then
         log_success "Database dump tersimpan di: $CURRENT_BACKUP_PATH/postgres_dump.sql"
@@ -137,6 +149,136 @@ run_restore() {
     log_success "✅ RESTORE SELESAI! Sistem telah kembali ke kondisi: $TARGET_ID"
 }
 
+# ==============================================================================
+# 3. MODUL PITR (BASE BACKUP + WAL ARCHIVE)
+# ==============================================================================
+# WAL di-archive terus-menerus oleh Postgres (archive_command) dan di-upload ke MinIO
+# oleh service wal-archiver, jadi biaya backup harian sebanding dengan volume perubahan.
+# Base backup cukup dibuat sesekali (mis. mingguan via cron).
+
+require_service() {
+    if ! docker compose ps | grep -q "$1"; then
+        log_error "Container $1 tidak berjalan! Coba jalankan 'docker compose up -d' dulu."
+        exit 1
+    fi
+}
+
+run_base_backup() {
+    # ID base backup memakai UTC agar bisa dibandingkan dengan target restore
+    BASE_ID=$(date -u +"%Y%m%d_%H%M%S")
+    log_info "Membuat base backup PostgreSQL -> $PITR_BASE_PREFIX/$BASE_ID/base.tar.gz ..."
+    require_service "$PG_SERVICE_NAME"
+    require_service "$WAL_ARCHIVER_SERVICE"
+
+    # -X none: WAL selama backup ikut ter-archive (pg_basebackup menunggu archive selesai)
+    docker compose exec -T $PG_SERVICE_NAME pg_basebackup -U $PG_USER -D - -Ft -X none -z \
+        | docker compose exec -T $WAL_ARCHIVER_SERVICE mc pipe "$PITR_BASE_PREFIX/$BASE_ID/base.tar.gz"
+    # Simpan langsung: perintah berikutnya (termasuk '[') menimpa PIPESTATUS
+    PIPE_RC=("${PIPESTATUS[@]}")
+
+    if [ "${PIPE_RC[0]}" -eq 0 ] && [ "${PIPE_RC[1]}" -eq 0 ]; then
+        log_success "✅ BASE BACKUP SELESAI! ID: $BASE_ID"
+    else
+        log_error "Gagal membuat base backup!"
+        exit 1
+    fi
+}
+
+run_wal_status() {
+    require_service "$PG_SERVICE_NAME"
+    require_service "$WAL_ARCHIVER_SERVICE"
+
+    log_info "Status archiver PostgreSQL:"
+    docker compose exec -T $PG_SERVICE_NAME psql -U $PG_USER -d $PG_DB -c \
+        "SELECT archived_count, last_archived_wal, last_archived_time, failed_count, last_failed_wal FROM pg_stat_archiver;"
+
+    log_info "Base backup tersedia:"
+    docker compose exec -T $WAL_ARCHIVER_SERVICE mc ls "$PITR_BASE_PREFIX/"
+    log_info "Ukuran WAL archive di MinIO:"
+    docker compose exec -T $WAL_ARCHIVER_SERVICE mc du "$PITR_WAL_PREFIX"
+}
+
+run_pitr_restore() {
+    TARGET_TIME=$1
+
+    if [ -z "$TARGET_TIME" ]; then
+        log_error "Harap tentukan waktu target restore."
+        log_info "Contoh: ./manage_disaster_recovery.sh restore --to \"2024-01-01 12:00:00\""
+        exit 1
+    fi
+
+    # Normalisasi ke UTC: dipakai untuk memilih base backup & recovery_target_time
+    if ! TARGET_ID=$(date -u -d "$TARGET_TIME" +"%Y%m%d_%H%M%S"); then
+        log_error "Format waktu tidak valid: $TARGET_TIME"
+        exit 1
+    fi
+    TARGET_UTC=$(date -u -d "$TARGET_TIME" +"%Y-%m-%d %H:%M:%S+00")
+
+    require_service "$WAL_ARCHIVER_SERVICE"
+
+    # Base backup terakhir yang dibuat SEBELUM target waktu
+    BASE_ID=$(docker compose exec -T $WAL_ARCHIVER_SERVICE mc ls "$PITR_BASE_PREFIX/" \
+        | awk '{print $NF}' | tr -d '/' | sort | awk -v target="$TARGET_ID" '$1 <= target' | tail -n 1)
+
+    if [ -z "$BASE_ID" ]; then
+        log_error "Tidak ada base backup sebelum $TARGET_UTC. Jalankan '$0 base-backup' terlebih dahulu."
+        exit 1
+    fi
+    log_info "Target: $TARGET_UTC | Base backup: $BASE_ID"
+
+    log_warn "⚠️  PERINGATAN: PROSES INI AKAN MENGHENTIKAN POSTGRES DAN MENGGANTI DATA DIRECTORY!"
+    read -p "Apakah Anda yakin ingin melanjutkan? (y/n) " -n 1 -r
+    echo
+    if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+        log_info "Restore dibatalkan."
+        exit 1
+    fi
+
+    # --- STEP A: AMBIL BASE BACKUP & WAL DARI MINIO ---
+    log_info "Downloading base backup & WAL archive dari MinIO..."
+    docker compose exec -T $WAL_ARCHIVER_SERVICE sh -c \
+        "rm -rf /pitr_restore/* && mc cp '$PITR_BASE_PREFIX/$BASE_ID/base.tar.gz' /pitr_restore/base.tar.gz && mc mirror --overwrite '$PITR_WAL_PREFIX' /pitr_restore/wal"
+    if [ $? -ne 0 ]; then
+        log_error "Gagal mengambil backup dari MinIO."
+        exit 1
+    fi
+
+    # --- STEP B: GANTI DATA DIRECTORY ---
+    log_info "Menghentikan PostgreSQL..."
+    docker compose stop $PG_SERVICE_NAME
+
+    OLD_DATA_DIR="${PG_DATA_DIR}.before_pitr_$TIMESTAMP"
+    mv "$PG_DATA_DIR" "$OLD_DATA_DIR"
+    log_info "Data directory lama dipindahkan ke $OLD_DATA_DIR"
+
+    # Ekstrak base backup + konfigurasi recovery di dalam container (sebagai root, lalu chown ke postgres)
+    RECOVERY_CONF="restore_command = 'cp /pitr_restore/wal/%f %p'
+recovery_target_time = '$TARGET_UTC'
+recovery_target_action = 'promote'"
+
+    docker compose run --rm --no-deps -e RECOVERY_CONF="$RECOVERY_CONF" --entrypoint bash $PG_SERVICE_NAME -c '
+        set -e
+        PGDATA=/var/lib/postgresql/data
+        tar -xzf /pitr_restore/base.tar.gz -C "$PGDATA"
+        touch "$PGDATA/recovery.signal"
+        echo "$RECOVERY_CONF" >> "$PGDATA/postgresql.auto.conf"
+        chown -R postgres:postgres "$PGDATA"
+        chmod 700 "$PGDATA"
+    '
+    if [ $? -ne 0 ]; then
+        log_error "Gagal menyiapkan data directory. Data lama masih ada di $OLD_DATA_DIR"
+        exit 1
+    fi
+
+    # --- STEP C: REPLAY WAL SAMPAI TARGET ---
+    log_info "Menjalankan PostgreSQL dalam mode recovery..."
+    docker compose up -d $PG_SERVICE_NAME
+
+    log_success "✅ PITR DIMULAI! Postgres me-replay WAL sampai $TARGET_UTC lalu promote."
+    log_info "Pantau progres: docker compose logs -f $PG_SERVICE_NAME"
+    log_warn "Setelah recovery selesai, hapus baris restore_command/recovery_target_* dari postgresql.auto.conf."
+}
+
 # ==============================================================================
 # MAIN MENU
 # ==============================================================================
@@ -145,13 +287,26 @@ case "$1" in
         run_backup
         ;;
     restore)
-        run_restore "$2"
+        if [ "$2" == "--to" ]; then
+            run_pitr_restore "$3"
+        else
+            run_restore "$2"
+        fi
+        ;;
+    base-backup)
+        run_base_backup
+        ;;
+    wal-status)
+        run_wal_status
         ;;
     *)
-        echo "Usage: $0 {backup|restore <backup_id>}"
+        echo "Usage: $0 {backup|restore <backup_id>|base-backup|restore --to <timestamp>|wal-status}"
         echo "Examples:"
         echo "  $0 backup"
         echo "  $0 restore 20240101_120000"
+        echo "  $0 base-backup"
+        echo "  $0 restore --to \"2024-01-01 12:00:00\""
+        echo "  $0 wal-status"
         exit 1
         ;;
 esac
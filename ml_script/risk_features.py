@@ -0,0 +1,44 @@
+import pandas as pd
+import numpy as np
+import os
+import re
+
+# Definisi fitur & artefak model yang dipakai bersama oleh training (risk_model.py),
+# feature store, dan scoring (risk_scoring.py). Sengaja tanpa import xgboost/sklearn/sqlalchemy
+# agar dashboard Streamlit bisa scoring tanpa memuat stack training.
+
+# Jika definisi fitur berubah, naikkan juga feature_store.FEATURE_SET_VERSION
+FEATURES = ["attacks_lag1", "attacks_lag2", "attacks_lag3", "mean_3y", "std_3y", "trend_1y", "year_scaled"]
+
+# Model pemenang per negara disimpan di sini agar bisa dipakai ulang oleh risk_scoring.py
+# (folder ml_script di-mount ke container Airflow, jadi dashboard di host ikut membacanya)
+MODEL_DIR = os.getenv("RISK_MODEL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"))
+
+
+def next_year_features(recent_attacks, next_year, year_min, year_max):
+    """
+    Membangun fitur untuk tahun berikutnya dari 3 tahun terakhir.
+    recent_attacks: array (n, 3) berisi jumlah serangan [t-2, t-1, t] per skenario.
+    """
+    recent = np.atleast_2d(np.asarray(recent_attacks, dtype=float))
+    next_feats = pd.DataFrame({
+        "attacks_lag1": recent[:, 2],
+        "attacks_lag2": recent[:, 1],
+        "attacks_lag3": recent[:, 0],
+        "mean_3y": recent.mean(axis=1),
+        "std_3y": recent.std(axis=1),
+        "trend_1y": recent[:, 2] - recent[:, 1],
+        "year_scaled": (next_year - year_min) / (year_max - year_min)
+    })
+    return next_feats[FEATURES].astype(float)
+
+
+def compute_risk_score(pred_val):
+    risk_score = min(max(pred_val, 0), 100)
+    if pred_val > 50: risk_score = 100
+    return risk_score
+
+
+def model_path(country):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", country).strip("_").lower()
+    return os.path.join(MODEL_DIR, f"{slug}.joblib")
@@ -0,0 +1,98 @@
+import pandas as pd
+import numpy as np
+from functools import lru_cache
+import joblib
+import logging
+import os
+
+from risk_features import MODEL_DIR, model_path, next_year_features, compute_risk_score
+
+# Jumlah model negara yang disimpan di memori (LRU: yang paling lama tidak dipakai dibuang)
+MODEL_CACHE_SIZE = int(os.getenv("RISK_MODEL_CACHE_SIZE", "64"))
+MAX_HORIZON = 10
+
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def _load_bundle(path, mtime):
+    # mtime ikut jadi key cache: model yang di-retrain oleh DAG otomatis dimuat ulang
+    logging.info(f"Loading model bundle {path}...")
+    return joblib.load(path)
+
+
+def load_country_model(country):
+    """Ambil bundle model pemenang suatu negara dari cache (load dari disk sekali saja)"""
+    path = model_path(country)
+    if not os.path.exists(path):
+        raise KeyError(f"Model untuk negara '{country}' tidak ditemukan di {MODEL_DIR}")
+    return _load_bundle(path, os.path.getmtime(path))
+
+
+def clear_cache():
+    _load_bundle.cache_clear()
+
+
+def forecast_country(country, horizon=1, last_year_attacks=None):
+    """
+    Forecast rekursif multi-tahun untuk satu atau beberapa skenario what-if.
+    last_year_attacks: None (pakai data aktual), angka, atau list angka/None (satu skenario per nilai).
+    Semua skenario diprediksi sekaligus (satu predict per tahun horizon).
+    """
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon harus antara 1 dan {MAX_HORIZON}")
+
+    bundle = load_country_model(country)
+    model = bundle["model"]
+
+    if last_year_attacks is None or np.isscalar(last_year_attacks):
+        scenarios = [last_year_attacks]
+    else:
+        scenarios = list(last_year_attacks)
+
+    # Skenario None = baseline aktual: nilai aktual hanya dipakai di matriks fitur,
+    # scenario_last_year_attacks tetap None agar baseline bisa dibedakan dari what-if
+    recent = np.tile(np.asarray(bundle["recent_attacks"], dtype=float), (len(scenarios), 1))
+    for i, value in enumerate(scenarios):
+        if value is not None:
+            recent[i, 2] = float(value)
+
+    rows = []
+    for step in range(1, horizon + 1):
+        year = bundle["last_year"] + step
+        feats = next_year_features(recent, year, bundle["year_min"], bundle["year_max"])
+        preds = np.expm1(model.predict(feats))
+
+        for i, pred_val in enumerate(preds):
+            pred_val = float(pred_val)
+            rows.append({
+                "country_name": country,
+                "scenario_last_year_attacks": scenarios[i],
+                "prediction_year": year,
+                "horizon": step,
+                "predicted_attacks": round(pred_val, 2),
+                "risk_score": round(compute_risk_score(pred_val), 2),
+                "model_used": bundle["model_used"]
+            })
+
+        # Rekursif: prediksi tahun ini menjadi lag untuk tahun berikutnya
+        recent = np.column_stack([recent[:, 1], recent[:, 2], np.maximum(preds, 0)])
+
+    return pd.DataFrame(rows)
+
+
+def forecast_batch(requests):
+    """
+    requests: list of dict {"country_name", "horizon" (opsional), "last_year_attacks" (opsional)}.
+    Skenario dengan negara & horizon yang sama digabung agar model hanya dipanggil sekali per tahun.
+    """
+    grouped = {}
+    for req in requests:
+        key = (req["country_name"], int(req.get("horizon", 1)))
+        grouped.setdefault(key, []).append(req.get("last_year_attacks"))
+
+    results = []
+    for (country, horizon), values in grouped.items():
+        results.append(forecast_country(country, horizon, values))
+
+    if not results:
+        return pd.DataFrame()
+    return pd.concat(results, ignore_index=True)
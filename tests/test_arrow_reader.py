@@ -0,0 +1,95 @@
+import ast
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT_DIR, 'ml_script'))
+
+pd = pytest.importorskip("pandas")
+arrow_reader = pytest.importorskip("arrow_reader")
+feature_store = pytest.importorskip("feature_store")
+
+
+def dashboard_queries():
+    """String SQL sql_* di dashboard.load_data (dibaca dari source, dashboard tidak di-import)"""
+    with open(os.path.join(ROOT_DIR, 'dashboard.py')) as f:
+        tree = ast.parse(f.read())
+    return {
+        node.targets[0].id: node.value.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Assign)
+        and isinstance(node.targets[0], ast.Name)
+        and node.targets[0].id.startswith("sql_")
+        and isinstance(node.value, ast.Constant)
+    }
+
+
+REPO_QUERIES = {**dashboard_queries(), "COUNTRY_SERIES_QUERY": feature_store.COUNTRY_SERIES_QUERY}
+
+
+class FakeTable:
+    def to_pandas(self, **kwargs):
+        return pd.DataFrame({"value": [1]})
+
+
+class FakeCursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, query):
+        # Driver ADBC membungkus query dengan COPY (...) TO STDOUT
+        copy_sql = f"COPY ({query}) TO STDOUT (FORMAT binary)"
+        if ";" in copy_sql:
+            raise SyntaxError(copy_sql)
+        self.executed.append(query)
+
+    def fetch_record_batch(self):
+        return self
+
+    def read_all(self):
+        return FakeTable()
+
+    def __iter__(self):
+        return iter([FakeTable()])
+
+
+class FakeDbapi:
+    def __init__(self):
+        self.executed = []
+
+    @contextmanager
+    def connect(self, uri):
+        yield self
+
+    @contextmanager
+    def cursor(self):
+        yield FakeCursor(self.executed)
+
+
+@pytest.fixture
+def fake_dbapi(monkeypatch):
+    dbapi = FakeDbapi()
+    monkeypatch.setattr(arrow_reader, "pg_dbapi", dbapi)
+    return dbapi
+
+
+def test_repo_queries_are_found():
+    assert {"sql_trend", "sql_map", "sql_mart", "sql_pred", "COUNTRY_SERIES_QUERY"} <= set(REPO_QUERIES)
+
+
+@pytest.mark.parametrize("name", sorted(REPO_QUERIES))
+def test_read_sql_arrow_strips_trailing_semicolon(fake_dbapi, name):
+    df = arrow_reader.read_sql_arrow(REPO_QUERIES[name], "postgresql+psycopg2://u:p@localhost:5432/db")
+
+    assert len(df) == 1
+    assert not fake_dbapi.executed[0].endswith(";")
+
+
+def test_iter_sql_arrow_strips_trailing_semicolon(fake_dbapi):
+    chunks = list(arrow_reader.iter_sql_arrow(feature_store.COUNTRY_SERIES_QUERY, "postgresql://u:p@localhost/db"))
+
+    assert len(chunks) == 1
+    assert fake_dbapi.executed == [arrow_reader.normalize_query(feature_store.COUNTRY_SERIES_QUERY)]
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ml_script'))
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+risk_scoring = pytest.importorskip("risk_scoring")
+
+
+class LastYearModel:
+    """Model dummy: prediksi = jumlah serangan tahun sebelumnya (attacks_lag1)"""
+
+    def predict(self, feats):
+        return np.log1p(feats["attacks_lag1"].to_numpy())
+
+
+@pytest.fixture
+def bundle(monkeypatch):
+    bundle = {
+        "country_name": "Testland",
+        "model": LastYearModel(),
+        "model_used": "XGBoost",
+        "recent_attacks": [4.0, 6.0, 8.0],
+        "last_year": 2019,
+        "year_min": 1970,
+        "year_max": 2019
+    }
+    monkeypatch.setattr(risk_scoring, "load_country_model", lambda country: bundle)
+    return bundle
+
+
+def test_forecast_batch_keeps_baseline_scenario_as_none(bundle):
+    df = risk_scoring.forecast_batch([
+        {"country_name": "Testland", "horizon": 2},
+        {"country_name": "Testland", "horizon": 2, "last_year_attacks": 20}
+    ])
+
+    assert len(df) == 4
+    baseline = df[df["scenario_last_year_attacks"].isna()]
+    whatif = df[df["scenario_last_year_attacks"].notna()]
+
+    assert list(baseline["predicted_attacks"]) == [8.0, 8.0]
+    assert list(whatif["predicted_attacks"]) == [20.0, 20.0]
+    assert set(whatif["scenario_last_year_attacks"]) == {20}
+
+
+def test_forecast_batch_whatif_equal_to_actual_stays_separate(bundle):
+    df = risk_scoring.forecast_batch([
+        {"country_name": "Testland"},
+        {"country_name": "Testland", "last_year_attacks": 8}
+    ])
+
+    assert df["scenario_last_year_attacks"].isna().sum() == 1
+    assert df["scenario_last_year_attacks"].notna().sum() == 1
+    assert list(df["predicted_attacks"]) == [8.0, 8.0]
+
+
+def test_risk_scoring_does_not_import_training_stack():
+    # Dashboard mengimpor risk_scoring: xgboost/sklearn/sqlalchemy dan konfigurasi
+    # logging/warnings milik risk_model tidak boleh ikut termuat
+    code = (
+        "import sys, warnings; sys.path.insert(0, 'ml_script'); import risk_scoring; "
+        "loaded = [m for m in ('risk_model', 'xgboost', 'sklearn', 'sqlalchemy') if m in sys.modules]; "
+        "assert not loaded, loaded; "
+        "assert ('ignore', None, Warning, None, 0) not in warnings.filters"
+    )
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
@@ -0,0 +1,118 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dags'))
+
+pytest.importorskip("airflow")
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+utils_s3_watch = pytest.importorskip("utils_s3_watch")
+
+from utils_s3_watch import (
+    S3ETagChangeSensor, detect_changed_keys, record_failed_attempt,
+    MAX_PIPELINE_ATTEMPTS, RETRY_BACKOFF
+)
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+BUCKET = "raw-data"
+
+
+def test_detect_changed_keys_skips_committed_and_pending():
+    current = {"gtd_raw.csv": {"etag": "a"}, "oecd_property.csv": {"etag": "b"}}
+
+    assert detect_changed_keys(current, {}, now=NOW) == ["gtd_raw.csv", "oecd_property.csv"]
+    assert detect_changed_keys(current, {"gtd_raw.csv": "a"}, now=NOW) == ["oecd_property.csv"]
+    assert detect_changed_keys(current, {"gtd_raw.csv": "a"}, {"oecd_property.csv": "b"}, now=NOW) == []
+
+
+def test_failed_etag_waits_for_backoff_then_stops_after_max_attempts():
+    current = {"gtd_raw.csv": {"etag": "a"}}
+    failed = {}
+
+    failure = record_failed_attempt(failed, "gtd_raw.csv", "a", NOW)
+    assert failure["attempts"] == 1
+    assert detect_changed_keys(current, {}, {}, failed, now=NOW) == []
+    assert detect_changed_keys(current, {}, {}, failed, now=NOW + RETRY_BACKOFF) == ["gtd_raw.csv"]
+
+    # Backoff berlipat setiap kali gagal
+    failure = record_failed_attempt(failed, "gtd_raw.csv", "a", NOW)
+    assert datetime.fromisoformat(failure["retry_after"]) == NOW + RETRY_BACKOFF * 2
+
+    for _ in range(MAX_PIPELINE_ATTEMPTS):
+        record_failed_attempt(failed, "gtd_raw.csv", "a", NOW)
+    assert detect_changed_keys(current, {}, {}, failed, now=NOW + timedelta(days=365)) == []
+
+    # File baru (ETag lain) langsung memicu lagi dan hitungan gagal di-reset
+    current = {"gtd_raw.csv": {"etag": "b"}}
+    assert detect_changed_keys(current, {}, {}, failed, now=NOW) == ["gtd_raw.csv"]
+    assert record_failed_attempt(failed, "gtd_raw.csv", "b", NOW)["attempts"] == 1
+
+
+class FakeVariable:
+    store = {}
+
+    @classmethod
+    def get(cls, key, default_var=None, deserialize_json=False):
+        return cls.store.get(key, default_var)
+
+    @classmethod
+    def set(cls, key, value, serialize_json=False):
+        cls.store[key] = value
+
+
+class FakeTaskInstance:
+    def __init__(self):
+        self.xcom = {}
+
+    def xcom_push(self, key, value):
+        self.xcom[key] = value
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    # moto sebagai S3 stand-in lokal (pengganti MinIO)
+    for name, value in {"AWS_ACCESS_KEY_ID": "test", "AWS_SECRET_ACCESS_KEY": "test",
+                        "AWS_DEFAULT_REGION": "us-east-1"}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(utils_s3_watch, "Variable", FakeVariable)
+    FakeVariable.store = {}
+
+    mock = moto.mock_s3() if hasattr(moto, "mock_s3") else moto.mock_aws()
+    with mock:
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def poke(sensor):
+    ti = FakeTaskInstance()
+    return sensor.poke({"ti": ti}), ti.xcom.get("changed_objects")
+
+
+def test_sensor_detects_new_and_changed_objects(s3_bucket):
+    sensor = S3ETagChangeSensor(task_id="wait", bucket_name=BUCKET, keys=["gtd_raw.csv"], aws_conn_id=None)
+
+    assert poke(sensor) == (False, None)
+
+    s3_bucket.put_object(Bucket=BUCKET, Key="gtd_raw.csv", Body=b"eventid\n1\n")
+    changed, published = poke(sensor)
+    assert changed
+    etag = published["gtd_raw.csv"]["etag"]
+    datetime.fromisoformat(published["gtd_raw.csv"]["last_modified"])
+
+    # Sedang diproses pipeline -> tidak dipicu ulang
+    FakeVariable.set(utils_s3_watch.PENDING_ETAG_VARIABLE, {"gtd_raw.csv": etag})
+    assert poke(sensor)[0] is False
+
+    # Sudah di-commit -> tetap diam sampai isi file berubah
+    FakeVariable.set(utils_s3_watch.PENDING_ETAG_VARIABLE, {})
+    FakeVariable.set(utils_s3_watch.ETAG_VARIABLE, {"gtd_raw.csv": etag})
+    assert poke(sensor)[0] is False
+
+    s3_bucket.put_object(Bucket=BUCKET, Key="gtd_raw.csv", Body=b"eventid\n1\n2\n")
+    changed, published = poke(sensor)
+    assert changed
+    assert published["gtd_raw.csv"]["etag"] != etag
@@ -0,0 +1,80 @@
+#!/bin/sh
+
+# ==============================================================================
+# GTD PROJECT - WAL SHIPPER (entrypoint service wal-archiver)
+# ==============================================================================
+# 1. Upload segmen WAL dari /wal_archive ke MinIO (mc mirror --watch)
+# 2. Pangkas salinan lokal yang sudah ada di MinIO dan lebih tua dari base backup terbaru
+# Jika mc mirror berhenti, script exit 1 dan docker compose me-restart container
+# (restart: unless-stopped), jadi WAL tidak berhenti ter-upload diam-diam.
+# ==============================================================================
+
+WAL_DIR="/wal_archive"
+MINIO_ALIAS="local"
+WAL_TARGET="$MINIO_ALIAS/system-backups/wal_archive"
+PRUNE_INTERVAL=${WAL_PRUNE_INTERVAL:-600}   # detik
+CHECK_INTERVAL=30
+
+# MinIO bisa belum siap walaupun container-nya sudah start (depends_on tidak menunggu)
+until mc alias set $MINIO_ALIAS http://minio:9000 minio_admin minio_secret > /dev/null; do
+    echo "⏳ MinIO belum siap, coba lagi dalam 5 detik..."
+    sleep 5
+done
+mc mb --ignore-existing "$MINIO_ALIAS/system-backups"
+
+newest_base_backup_segment() {
+    # pg_basebackup menulis <segmen_awal>.<offset>.backup ke archive saat base backup selesai
+    newest=""
+    for f in "$WAL_DIR"/*.backup; do
+        [ -e "$f" ] || continue
+        name=$(basename "$f")
+        if [ -z "$newest" ] || [ "$name" \> "$newest" ]; then
+            newest=$name
+        fi
+    done
+    echo "$newest" | cut -c1-24
+}
+
+prune_archived_wal() {
+    keep_from=$(newest_base_backup_segment)
+    if [ -z "$keep_from" ]; then
+        return
+    fi
+
+    pruned=0
+    for f in "$WAL_DIR"/*; do
+        name=$(basename "$f")
+        # Hanya segmen WAL (24 hex); file .history/.backup selalu disimpan
+        case "$name" in
+            [0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F][0-9A-F]) ;;
+            *) continue ;;
+        esac
+        [ "$name" \< "$keep_from" ] || continue
+
+        # Restore PITR mengambil WAL dari MinIO, jadi salinan lokal boleh dihapus setelah ter-upload
+        if mc stat "$WAL_TARGET/$name" > /dev/null 2>&1; then
+            rm -f "$f"
+            pruned=$((pruned + 1))
+        fi
+    done
+
+    if [ "$pruned" -gt 0 ]; then
+        echo "🧹 $pruned segmen WAL lokal sebelum $keep_from dihapus (sudah ada di MinIO)."
+    fi
+}
+
+mc mirror --watch --overwrite --exclude '*.tmp' "$WAL_DIR" "$WAL_TARGET" &
+MIRROR_PID=$!
+
+elapsed=0
+while kill -0 "$MIRROR_PID" 2> /dev/null; do
+    sleep $CHECK_INTERVAL
+    elapsed=$((elapsed + CHECK_INTERVAL))
+    if [ "$elapsed" -ge "$PRUNE_INTERVAL" ]; then
+        prune_archived_wal
+        elapsed=0
+    fi
+done
+
+echo "❌ mc mirror berhenti, container akan di-restart."
+exit 1